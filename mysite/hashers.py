@@ -0,0 +1,20 @@
+"""
+Password hashers for the mysite project.
+
+Defines an Argon2 hasher tuned to the OWASP recommended profile.
+"""
+
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id hasher using 46 MiB of memory, one iteration and one lane.
+
+    This is the OWASP minimum profile for Argon2id. It keeps each hash
+    memory-hard while costing less time than Django's default settings.
+    """
+
+    memory_cost = 47104
+    time_cost = 1
+    parallelism = 1
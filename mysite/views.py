@@ -5,7 +5,7 @@ This module contains views for user authentication, including registration and l
 """
 
 from django.shortcuts import render, redirect
-from django.contrib.auth import login, authenticate
+from django.contrib.auth import login
 from django.contrib.auth.forms import UserCreationForm
 
 
@@ -13,7 +13,7 @@ def signup(request):
     """
     Register a new user.
 
-    If the request method is POST, validate and save the form data, then authenticate and log in the user.
+    If the request method is POST, validate and save the form data, then log in the new user.
     Redirect to the polls index page upon successful registration.
     If the form is not valid, display errors on the signup page.
     If the request method is GET, render the signup form.
@@ -21,12 +21,11 @@ def signup(request):
     if request.method == 'POST':
         form = UserCreationForm(request.POST)
         if form.is_valid():
-            form.save()
-            # get named fields from the form data
-            username = form.cleaned_data.get('username')
-            # password input field is named 'password1'
-            raw_passwd = form.cleaned_data.get('password1')
-            user = authenticate(username=username, password=raw_passwd)
+            # log in the saved user directly instead of authenticating
+            # again, which would hash the password a second time;
+            # naming the backend lets login() skip the backend lookup
+            user = form.save()
+            user.backend = 'django.contrib.auth.backends.ModelBackend'
             login(request, user)
             return redirect('polls:index')
         # if the form is not valid, we should display a message in signup.html
@@ -4,10 +4,72 @@ Admin module for managing Polls application models in the Django admin interface
 Registers the following models:
 - Question
 - Choice
+- Vote
 """
 
 from django.contrib import admin
-from .models import Question, Choice
+from .models import Question, Choice, Vote
 
-admin.site.register(Question)
-admin.site.register(Choice)
+
+class QuestionAdmin(admin.ModelAdmin):
+    """Admin for questions, showing whether each was published recently."""
+
+    list_display = ('question_text', 'pub_date', 'recent')
+
+    def get_queryset(self, request):
+        """Compute the recently published flag in the changelist query."""
+        return super().get_queryset(request).with_recent()
+
+    @admin.display(boolean=True, description='published recently?', ordering='recent')
+    def recent(self, obj):
+        """Return the annotated recently published flag of the question."""
+        return obj.recent
+
+
+class ChoiceAdmin(admin.ModelAdmin):
+    """
+    Admin for choices, listing each choice with its question and vote count.
+
+    The question of an existing choice cannot be changed, as its votes
+    store that question too.
+    """
+
+    list_display = ('choice_text', 'question', 'vote_count')
+    list_select_related = ('question',)
+    readonly_fields = ('vote_count',)
+
+    def get_readonly_fields(self, request, obj=None):
+        """Make the question read-only once the choice has been created."""
+        if obj is None:
+            return self.readonly_fields
+        return self.readonly_fields + ('question',)
+
+
+class VoteAdmin(admin.ModelAdmin):
+    """
+    Read-only admin for votes, fetching each vote's user and choice in one query.
+
+    Votes are cast by users on the site, so they cannot be added, changed
+    or deleted here.
+    """
+
+    def get_queryset(self, request):
+        """Join the user, choice and question into the changelist query."""
+        return super().get_queryset(request).with_related()
+
+    def has_add_permission(self, request):
+        """Do not allow adding votes in the admin."""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        """Do not allow changing votes in the admin."""
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        """Do not allow deleting votes in the admin."""
+        return False
+
+
+admin.site.register(Question, QuestionAdmin)
+admin.site.register(Choice, ChoiceAdmin)
+admin.site.register(Vote, VoteAdmin)
@@ -16,3 +16,7 @@ class PollsConfig(AppConfig):
 
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'polls'
+
+    def ready(self):
+        """Register the app's signal handlers once, as soon as the app is loaded."""
+        from . import signals  # noqa: F401
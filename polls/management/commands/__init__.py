@@ -0,0 +1 @@
+"""Management commands for the polls app, run with manage.py."""
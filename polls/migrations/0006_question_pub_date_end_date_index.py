@@ -0,0 +1,21 @@
+# Generated by Django 5.1.15 on 2026-10-15 04:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('polls', '0005_choice_vote_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['-pub_date', 'end_date'], name='q_pubdate_enddate_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['end_date'], name='polls_quest_end_dat_935f39_idx'),
+        ),
+    ]
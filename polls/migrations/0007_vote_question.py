@@ -0,0 +1,21 @@
+# Generated by Django 5.1.15 on 2026-10-15 04:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('polls', '0006_question_pub_date_end_date_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vote',
+            name='question',
+            field=models.ForeignKey(editable=False, null=True,
+                                    on_delete=django.db.models.deletion.CASCADE,
+                                    to='polls.question'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.15 on 2026-10-15 04:40
+
+from django.db import migrations
+from django.db.models import Count, Exists, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_vote_question(apps, schema_editor):
+    """Copy the question of every vote's choice onto the vote."""
+    Choice = apps.get_model('polls', 'Choice')
+    Vote = apps.get_model('polls', 'Vote')
+    Vote.objects.update(question=Subquery(
+        Choice.objects.filter(pk=OuterRef('choice_id')).values('question_id')
+    ))
+
+
+def remove_duplicate_votes(apps, schema_editor):
+    """
+    Keep only the latest vote of each user on each question.
+
+    Concurrent votes could record more than one vote for a user on the same
+    question, which the unique constraint added next would reject. The vote
+    counts of all choices are recounted afterwards.
+    """
+    Choice = apps.get_model('polls', 'Choice')
+    Vote = apps.get_model('polls', 'Vote')
+    newer = Vote.objects.filter(user=OuterRef('user'), question=OuterRef('question'),
+                                pk__gt=OuterRef('pk'))
+    Vote.objects.filter(Exists(newer)).delete()
+    votes = (Vote.objects.filter(choice=OuterRef('pk'))
+             .values('choice').annotate(c=Count('pk')).values('c'))
+    Choice.objects.update(vote_count=Coalesce(Subquery(votes), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('polls', '0007_vote_question'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_vote_question, migrations.RunPython.noop),
+        migrations.RunPython(remove_duplicate_votes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.15 on 2026-10-15 04:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('polls', '0009_alter_vote_question'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='choice',
+            index=models.Index(fields=['question', 'id'], name='polls_choic_questio_9824a1_idx'),
+        ),
+    ]
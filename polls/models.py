@@ -7,10 +7,68 @@ Defines the Question, Choice, and Vote models.
 import datetime
 
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
+from django.db.models import BooleanField, Case, Count, ExpressionWrapper, OuterRef, Q, Subquery, When
+from django.db.models.functions import Coalesce, Now
 from django.utils import timezone
 
 
+class QuestionQuerySet(models.QuerySet):
+    """QuerySet for questions, filtering on the publication and voting period in SQL."""
+
+    def published(self, now=None):
+        """
+        Return questions whose publication date has passed.
+
+        Args:
+            now (datetime, optional): The current time, if already known.
+                Defaults to the database's current time.
+        """
+        if now is None:
+            now = Now()
+        return self.filter(pub_date__lte=now)
+
+    def votable(self, now=None):
+        """
+        Return questions that are published and still open for voting.
+
+        Args:
+            now (datetime, optional): The current time, if already known.
+                Defaults to the database's current time.
+        """
+        if now is None:
+            now = Now()
+        return self.filter(Question.published_can_vote_q(now))
+
+    def with_voting_allowed(self, now=None):
+        """
+        Annotate each question with ``voting_allowed``, computed in SQL like Question.can_vote().
+
+        Args:
+            now (datetime, optional): The current time, if already known.
+                Defaults to the database's current time.
+        """
+        if now is None:
+            now = Now()
+        return self.annotate(voting_allowed=Case(
+            When(Question.published_can_vote_q(now), then=True),
+            default=False,
+            output_field=BooleanField(),
+        ))
+
+    def with_recent(self):
+        """
+        Annotate each question with ``recent``, computed in SQL.
+
+        ``recent`` is True when the question was published within the last day,
+        matching Question.was_published_recently().
+        """
+        return self.annotate(recent=ExpressionWrapper(
+            Q(pub_date__gte=Now() - datetime.timedelta(days=1)) & Q(pub_date__lte=Now()),
+            output_field=BooleanField(),
+        ))
+
+
 class Question(models.Model):
     """
     A poll question.
@@ -25,34 +83,72 @@ class Question(models.Model):
     pub_date = models.DateTimeField('date published', default=timezone.now)
     end_date = models.DateTimeField('date end', null=True, blank=True)
 
-    def was_published_recently(self):
+    objects = QuestionQuerySet.as_manager()
+
+    class Meta:
+        """Index the publication and voting period columns used in filters."""
+
+        indexes = [
+            models.Index(fields=['-pub_date', 'end_date'], name='q_pubdate_enddate_idx'),
+            models.Index(fields=['end_date']),
+        ]
+
+    @staticmethod
+    def published_can_vote_q(now):
+        """
+        Return the condition for a question being published and open for voting.
+
+        This is the SQL counterpart of can_vote(), shared by every query that
+        needs to know whether voting is allowed.
+
+        Args:
+            now (datetime or expression): The current time.
+
+        Returns:
+            Q: The filter condition.
+        """
+        return Q(pub_date__lte=now) & (Q(end_date__isnull=True) | Q(end_date__gte=now))
+
+    def was_published_recently(self, now=None):
         """
         Check if the question was published within the last day.
 
+        Args:
+            now (datetime, optional): The current time, if already known.
+
         Returns:
             bool: True if published within the last day, False otherwise.
         """
-        now = timezone.now()
+        if now is None:
+            now = timezone.now()
         return now - datetime.timedelta(days=1) <= self.pub_date <= now
 
-    def is_published(self):
+    def is_published(self, now=None):
         """
         Return True if the current date-time is on or after the publication date.
 
+        Args:
+            now (datetime, optional): The current time, if already known.
+
         Returns:
             bool: True if the question is published, False otherwise.
         """
-        now = timezone.localtime()
+        if now is None:
+            now = timezone.localtime()
         return now >= self.pub_date
 
-    def can_vote(self):
+    def can_vote(self, now=None):
         """
         Return True if voting is allowed for this question.
 
+        Args:
+            now (datetime, optional): The current time, if already known.
+
         Returns:
             bool: True if voting is allowed, False otherwise.
         """
-        now = timezone.localtime()
+        if now is None:
+            now = timezone.localtime()
         if self.end_date:
             return self.pub_date <= now <= self.end_date
         return now >= self.pub_date
@@ -62,6 +158,25 @@ class Question(models.Model):
         return self.question_text
 
 
+class ChoiceQuerySet(models.QuerySet):
+    """QuerySet for choices."""
+
+    def recount_votes(self):
+        """
+        Set the vote count of every choice in the queryset from the Vote table.
+
+        The counts are recomputed with a correlated subquery in a single
+        UPDATE. Use this after votes were written without ``post_save`` and
+        ``post_delete`` signals, e.g. by ``bulk_create`` or a raw SQL load.
+
+        Returns:
+            int: The number of choices updated.
+        """
+        counts = (Vote.objects.filter(choice=OuterRef('pk'))
+                  .values('choice').annotate(c=Count('pk')).values('c'))
+        return self.update(vote_count=Coalesce(Subquery(counts), 0))
+
+
 class Choice(models.Model):
     """
     A choice for a poll question.
@@ -69,27 +184,60 @@ class Choice(models.Model):
     Attributes:
         question (Question): The question this choice is related to.
         choice_text (str): The text of the choice.
+        vote_count (int): The number of votes for this choice,
+            kept in step with the Vote table by the receivers in
+            ``polls.signals``.
     """
 
     question = models.ForeignKey(Question, on_delete=models.CASCADE)
     choice_text = models.CharField(max_length=200)
-    # votes = models.IntegerField(default=0)
+    vote_count = models.PositiveIntegerField(default=0)
 
-    @property
-    def votes(self):
-        """
-        Return the number of votes for this choice.
+    objects = ChoiceQuerySet.as_manager()
 
-        Returns:
-            int: The number of votes.
-        """
-        return Vote.objects.filter(choice=self).count()
+    class Meta:
+        """Index choices by question so a choice can be checked against its question from the index alone."""
+
+        indexes = [models.Index(fields=['question', 'id'])]
 
     def __str__(self):
         """Return the string representation of the choice."""
         return self.choice_text
 
 
+class VoteQuerySet(models.QuerySet):
+    """QuerySet for votes."""
+
+    def with_related(self):
+        """
+        Return votes with their user, choice and question joined in.
+
+        Use this when iterating votes and printing them, so ``__str__``
+        does not issue extra queries for every vote.
+        """
+        return self.select_related('user', 'choice__question')
+
+    def bulk_cast(self, pairs, batch_size=1000):
+        """
+        Create votes for many (user, choice) pairs with multi-row INSERTs.
+
+        A user gets at most one vote per question: pairs for a question the
+        user has already voted on are skipped by the database. Like any
+        ``bulk_create``, this does not call ``save()`` or send ``pre_save`` and
+        ``post_save`` signals, so the vote counts of the affected choices are
+        recounted afterwards in a single UPDATE.
+
+        Args:
+            pairs (iterable): (user, choice) pairs to record votes for.
+            batch_size (int): The maximum number of votes per INSERT.
+        """
+        votes = [self.model(user=user, choice=choice, question_id=choice.question_id)
+                 for user, choice in pairs]
+        with transaction.atomic(using=self.db):
+            self.bulk_create(votes, batch_size=batch_size, ignore_conflicts=True)
+            Choice.objects.filter(pk__in={vote.choice_id for vote in votes}).recount_votes()
+
+
 class Vote(models.Model):
     """
     Record a choice for a question made by a user.
@@ -97,10 +245,53 @@ class Vote(models.Model):
     Attributes:
         user (User): The user who made the vote.
         choice (Choice): The choice that was voted for.
+        question (Question): The question of the choice, copied from it on save.
     """
 
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     choice = models.ForeignKey(Choice, on_delete=models.CASCADE)
+    question = models.ForeignKey(Question, on_delete=models.CASCADE, editable=False)
+
+    objects = VoteQuerySet.as_manager()
+
+    class Meta:
+        """Allow a user only one vote per question."""
+
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'question'], name='uniq_user_question_vote'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Load a vote, remembering its choice so a later save can tell whether it moved."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_choice_id = instance.__dict__.get('choice_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        Save the vote, keeping its question in step with its choice.
+
+        The question is taken from the assigned choice object when there is
+        one. A new vote given both ``choice_id`` and ``question_id`` keeps that
+        question; otherwise, and for a saved vote whose ``choice_id`` has
+        changed, the question is read from the database by ``choice_id``.
+        A save limited by ``update_fields`` to the choice also writes the
+        question, so a moved vote never keeps the question of the old choice.
+        """
+        if Vote.choice.is_cached(self):
+            self.question_id = self.choice.question_id
+        elif self.question_id is None or (
+            not self._state.adding
+            and self.choice_id != getattr(self, '_loaded_choice_id', None)
+        ):
+            self.question_id = Choice.objects.values_list(
+                'question_id', flat=True
+            ).get(pk=self.choice_id)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'choice', 'choice_id'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'question'}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         """Return the string representation of the vote."""
@@ -0,0 +1,112 @@
+"""
+Signal handlers for the Polls app.
+
+This module logs user logins, logouts and failed logins, clears the cached
+question list of the index page when questions change, and keeps the vote
+counts of choices in step with their votes.
+It is imported from PollsConfig.ready(), so each handler is registered
+exactly once, when the app loads.
+"""
+
+import logging
+from django.contrib.auth.signals import (
+    user_logged_in, user_logged_out, user_login_failed
+)
+from django.core.cache import caches
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Choice, Question, Vote
+
+logger = logging.getLogger("polls")
+
+
+@receiver(user_logged_in)
+def log_user_login(sender, request, user, **kwargs):
+    """
+    Log user login events.
+
+    Record the login event with the user's username and IP address.
+    """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    ip_addr = get_client_ip(request)
+    logger.info(f"{user.username} logged in from {ip_addr}")
+
+
+@receiver(user_logged_out)
+def log_user_logout(sender, request, user, **kwargs):
+    """
+    Log user logout events.
+
+    Record the logout event with the user's username and IP address.
+    """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    ip_addr = get_client_ip(request)
+    logger.info(f"{user.username} logged out from {ip_addr}")
+
+
+@receiver(user_login_failed)
+def log_user_login_failed(sender, credentials, request, **kwargs):
+    """
+    Log failed login attempts.
+
+    Record failed login attempts with the username and IP address.
+    """
+    if not logger.isEnabledFor(logging.WARNING):
+        return
+    ip_addr = get_client_ip(request)
+    logger.warning(f"Failed login for {credentials.get('username')} from {ip_addr}")
+
+
+@receiver([post_save, post_delete], sender=Question)
+def clear_index_cache(sender, **kwargs):
+    """
+    Clear the cached index question list when a question is saved or deleted.
+
+    The 'polls_index' cache is local to each process, so this only clears the
+    list cached by the current worker. Other workers show an edited question
+    once their entry expires, within a minute.
+    """
+    caches['polls_index'].clear()
+
+
+@receiver(post_save, sender=Vote)
+def count_saved_vote(sender, instance, created, **kwargs):
+    """
+    Adjust the vote counts of choices when a vote is created or moved.
+
+    A new vote adds one to its choice; a vote moved to another choice takes
+    one off the old choice and adds one to the new one. When the previous
+    choice of a saved vote is unknown, e.g. for a vote saved by loaddata,
+    the choices of its question are recounted from the Vote table.
+    """
+    previous_choice_id = getattr(instance, '_loaded_choice_id', None)
+    if created:
+        Choice.objects.filter(pk=instance.choice_id).update(vote_count=F('vote_count') + 1)
+    elif previous_choice_id is None:
+        Choice.objects.filter(question_id=instance.question_id).recount_votes()
+    elif previous_choice_id != instance.choice_id:
+        Choice.objects.filter(pk=previous_choice_id).update(vote_count=F('vote_count') - 1)
+        Choice.objects.filter(pk=instance.choice_id).update(vote_count=F('vote_count') + 1)
+    instance._loaded_choice_id = instance.choice_id
+
+
+@receiver(post_delete, sender=Vote)
+def count_deleted_vote(sender, instance, **kwargs):
+    """Take a deleted vote, including one deleted by a cascade, off its choice."""
+    Choice.objects.filter(pk=instance.choice_id).update(vote_count=F('vote_count') - 1)
+
+
+def get_client_ip(request):
+    """
+    Get the visitor’s IP address using request headers.
+
+    Returns the IP address from the HTTP_X_FORWARDED_FOR header or REMOTE_ADDR.
+    """
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        # only the first (client) address is needed, so don't split the whole list
+        return x_forwarded_for.partition(',')[0].strip()
+    return request.META.get('REMOTE_ADDR')
@@ -1,7 +1,8 @@
 from django.urls import reverse
-from django.test import TestCase
+from django.test import RequestFactory, TestCase
 from django.contrib.auth.models import User
 from polls.models import Question, Choice
+from polls.signals import get_client_ip
 from mysite import settings
 
 
@@ -10,31 +11,31 @@ class UserAuthTest(TestCase):
     Test cases related to user authentication and voting access.
     """
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """
         Create a test user and a poll question with choices
-        for authentication and voting tests.
+        for authentication and voting tests, once for the whole class.
         """
-        super().setUp()
-        self.username = "testuser"
-        self.password = "FatChance!"
-        self.user1 = User.objects.create_user(username=self.username,
-                                              password=self.password,
-                                              email="testuser@nowhere.com")
-        self.user1.first_name = "Tester"
-        self.user1.save()
+        cls.username = "testuser"
+        cls.password = "FatChance!"
+        cls.user1 = User.objects.create_user(username=cls.username,
+                                             password=cls.password,
+                                             email="testuser@nowhere.com")
+        cls.user1.first_name = "Tester"
+        cls.user1.save()
 
         # Create a poll question with choices
         q = Question.objects.create(question_text="First Poll Question")
-        for n in range(1, 4):
-            Choice.objects.create(choice_text=f"Choice {n}", question=q)
-        self.question = q
+        Choice.objects.bulk_create([
+            Choice(choice_text=f"Choice {n}", question=q) for n in range(1, 4)
+        ])
+        cls.question = q
 
     def test_logout(self):
         """Test if a user can log out successfully using the logout URL."""
         logout_url = reverse("logout")
-        self.assertTrue(self.client.login(username=self.username,
-                                          password=self.password))
+        self.client.force_login(self.user1)
         response = self.client.post(logout_url)
         self.assertEqual(302, response.status_code)
         self.assertRedirects(response, reverse(settings.LOGOUT_REDIRECT_URL))
@@ -52,6 +53,31 @@ class UserAuthTest(TestCase):
         self.assertEqual(302, response.status_code)
         self.assertRedirects(response, reverse(settings.LOGIN_REDIRECT_URL))
 
+    def test_signup_logs_in_new_user(self):
+        """
+        Test if a new user is logged in right after signing up.
+        """
+        form_data = {"username": "newuser",
+                     "password1": "Sign-Up-99!",
+                     "password2": "Sign-Up-99!"}
+        response = self.client.post(reverse("signup"), form_data)
+        self.assertRedirects(response, reverse("polls:index"))
+        new_user = User.objects.get(username="newuser")
+        self.assertEqual(int(self.client.session["_auth_user_id"]),
+                         new_user.pk)
+
+    def test_client_ip_from_forwarded_header(self):
+        """
+        Test if the client IP is the first address in X-Forwarded-For,
+        falling back to REMOTE_ADDR when the header is missing.
+        """
+        factory = RequestFactory()
+        request = factory.get("/", HTTP_X_FORWARDED_FOR="10.0.0.1 , 10.0.0.2",
+                              REMOTE_ADDR="127.0.0.1")
+        self.assertEqual(get_client_ip(request), "10.0.0.1")
+        request = factory.get("/", REMOTE_ADDR="127.0.0.1")
+        self.assertEqual(get_client_ip(request), "127.0.0.1")
+
     def test_auth_required_to_vote(self):
         """
         Test if authentication is required to submit a vote.
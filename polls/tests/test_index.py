@@ -1,18 +1,11 @@
+import datetime
 from django.urls import reverse
 from django.test import TestCase
 from django.utils import timezone
+from django.core.cache import caches
+from django.contrib.auth.models import User
 from polls.models import Question
-import datetime
-
-
-def create_question(question_text, days):
-    """
-    Create a question with the given `question_text` and publish the question
-    with a pub_date offset by the given number of `days` from now.
-    Negative values indicate a past date and positive values a future date.
-    """
-    time = timezone.now() + datetime.timedelta(days=days)
-    return Question.objects.create(question_text=question_text, pub_date=time)
+from polls.tests.utils import create_question
 
 
 class QuestionIndexViewTests(TestCase):
@@ -20,6 +13,10 @@ class QuestionIndexViewTests(TestCase):
     Test cases for the index view of the polls app.
     """
 
+    def setUp(self):
+        """Start each test with an empty index question list cache."""
+        caches['polls_index'].clear()
+
     def test_no_questions(self):
         """
         If no questions exist, an appropriate message should be displayed.
@@ -77,3 +74,80 @@ class QuestionIndexViewTests(TestCase):
         response = self.client.get(reverse('polls:index'))
         self.assertQuerySetEqual(response.context['latest_question_list'], [
             question2, question1])
+
+    def test_question_change_clears_cached_index(self):
+        """
+        Saving a question should clear the cached question list,
+        so the new question is listed right away.
+        """
+        self.client.get(reverse('polls:index'))
+        question = create_question(question_text="New question.", days=-1)
+        response = self.client.get(reverse('polls:index'))
+        self.assertQuerySetEqual(response.context['latest_question_list'],
+                                 [question])
+
+    def test_cached_index_does_not_leak_user(self):
+        """
+        The cached index should not show a logged-in user's name
+        to an anonymous visitor or to another user.
+        """
+        create_question(question_text="Past question.", days=-1)
+        alice = User.objects.create_user(username='alice')
+        bob = User.objects.create_user(username='bob')
+        self.client.force_login(alice)
+        self.assertContains(self.client.get(reverse('polls:index')),
+                            "Welcome back, alice")
+
+        self.client.logout()
+        response = self.client.get(reverse('polls:index'))
+        self.assertContains(response, "Past question.")
+        self.assertNotContains(response, "alice")
+
+        self.client.force_login(bob)
+        response = self.client.get(reverse('polls:index'))
+        self.assertContains(response, "Welcome back, bob")
+        self.assertNotContains(response, "alice")
+
+    def test_cached_list_keyed_on_latest_question(self):
+        """
+        A newly published question should be listed even when the cache
+        is not cleared, e.g. on another worker.
+        """
+        self.client.get(reverse('polls:index'))
+        question = Question.objects.bulk_create([
+            Question(question_text="Bulk question.",
+                     pub_date=timezone.now() - datetime.timedelta(days=1))
+        ])[0]
+        response = self.client.get(reverse('polls:index'))
+        self.assertContains(response, "Bulk question.")
+        self.assertQuerySetEqual(response.context['latest_question_list'],
+                                 [question])
+
+    def test_voting_status(self):
+        """
+        The index page should mark questions whose voting period
+        has ended as closed and the others as open.
+        """
+        open_question = create_question(question_text="Open question.",
+                                        days=-5)
+        closed_question = create_question(question_text="Closed question.",
+                                          days=-5)
+        closed_question.end_date = closed_question.pub_date
+        closed_question.save()
+        response = self.client.get(reverse('polls:index'))
+        status = {question.pk: question.voting_allowed
+                  for question in response.context['latest_question_list']}
+        self.assertEqual(status, {open_question.pk: True,
+                                  closed_question.pk: False})
+
+    def test_index_is_paginated(self):
+        """
+        The index page should list at most 25 questions per page,
+        with the rest on the next page.
+        """
+        for n in range(26):
+            create_question(question_text=f"Question {n}.", days=-n - 1)
+        response = self.client.get(reverse('polls:index'))
+        self.assertEqual(len(response.context['latest_question_list']), 25)
+        response = self.client.get(reverse('polls:index'), {'page': 2})
+        self.assertEqual(len(response.context['latest_question_list']), 1)
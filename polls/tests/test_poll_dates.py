@@ -1,19 +1,10 @@
 from django.test import TestCase
 from polls.models import Question
+from polls.tests.utils import create_question
 from django.utils import timezone
 import datetime
 
 
-def create_question(question_text, days):
-    """
-    Create a question with the given `question_text` and publish the question
-    with a pub_date offset by the given number of `days` from now.
-    Negative values indicate a past date and positive values a future date.
-    """
-    time = timezone.now() + datetime.timedelta(days=days)
-    return Question.objects.create(question_text=question_text, pub_date=time)
-
-
 class QuestionModelTests(TestCase):
     """
     Test cases for the Question model, focusing on publication dates.
@@ -43,6 +34,18 @@ class QuestionModelTests(TestCase):
         past_question = create_question(question_text='Past Question', days=-5)
         self.assertTrue(past_question.is_published())
 
+    def test_with_recent_matches_was_published_recently(self):
+        """
+        The recent annotation should agree with was_published_recently()
+        for old, recent and future questions.
+        """
+        create_question(question_text='Old Question', days=-5)
+        create_question(question_text='Recent Question', days=-0.5)
+        create_question(question_text='Future Question', days=5)
+        for question in Question.objects.with_recent():
+            self.assertEqual(question.recent,
+                             question.was_published_recently())
+
 
 class QuestionVoteTests(TestCase):
     """
@@ -80,3 +83,17 @@ class QuestionVoteTests(TestCase):
             question_text='Vote Not Allowed Yet Question',
             days=5)
         self.assertFalse(question.can_vote())
+
+    def test_votable_questions(self):
+        """
+        Only published questions whose voting period has not ended
+        should be returned by the votable() queryset.
+        """
+        open_question = create_question(question_text='Open Question',
+                                        days=-1)
+        ended_question = create_question(question_text='Ended Question',
+                                         days=-5)
+        ended_question.end_date = timezone.now() - datetime.timedelta(days=1)
+        ended_question.save()
+        create_question(question_text='Future Question', days=5)
+        self.assertQuerySetEqual(Question.objects.votable(), [open_question])
@@ -1,4 +1,5 @@
 from django.test import TestCase
+from django.urls import reverse
 from django.contrib.auth.models import User
 from polls.models import Question, Choice, Vote
 
@@ -8,24 +9,286 @@ class VoteTestCase(TestCase):
     Test cases for the voting functionality in the polls app.
     """
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """
         Create a test user, a question,
         and a choice for testing voting functionality.
         """
-        self.user = User.objects.create(username='testuser')
-        self.question = (Question.objects.
-                         create(question_text='Test question'))
-        self.choice = (Choice.objects.
-                       create(question=self.question,
-                              choice_text='Test choice'))
+        cls.user = User.objects.create(username='testuser')
+        cls.question = (Question.objects.
+                        create(question_text='Test question'))
+        cls.choice = (Choice.objects.
+                      create(question=cls.question,
+                             choice_text='Test choice'))
 
     def test_user_can_vote(self):
         """
         Test if a user can successfully vote for a choice.
         """
-        Vote.objects.create(user=self.user, choice=self.choice)
+        self.client.force_login(self.user)
+        self.client.post(reverse('polls:vote', args=(self.question.id,)),
+                         {'choice': self.choice.id})
 
         # Fetch the choice again to ensure the vote count is updated
         choice = Choice.objects.get(pk=self.choice.pk)
-        self.assertEqual(choice.votes, 1)
+        self.assertEqual(choice.vote_count, 1)
+        self.assertEqual(Vote.objects.get(user=self.user).question,
+                         self.question)
+
+    def test_changing_vote_moves_count(self):
+        """
+        Voting again for another choice should move the vote count
+        from the previous choice to the new one.
+        """
+        other = Choice.objects.create(question=self.question,
+                                      choice_text='Other choice')
+        self.client.force_login(self.user)
+        vote_url = reverse('polls:vote', args=(self.question.id,))
+        self.client.post(vote_url, {'choice': self.choice.id})
+        self.client.post(vote_url, {'choice': other.id})
+
+        self.choice.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.choice.vote_count, 0)
+        self.assertEqual(other.vote_count, 1)
+        self.assertEqual(Vote.objects.filter(user=self.user).count(), 1)
+
+    def test_repeated_vote_counts_once(self):
+        """
+        Voting twice for the same choice should keep a single vote.
+        """
+        self.client.force_login(self.user)
+        vote_url = reverse('polls:vote', args=(self.question.id,))
+        self.client.post(vote_url, {'choice': self.choice.id})
+        self.client.post(vote_url, {'choice': self.choice.id})
+
+        self.choice.refresh_from_db()
+        self.assertEqual(self.choice.vote_count, 1)
+        self.assertEqual(Vote.objects.filter(user=self.user).count(), 1)
+
+    def test_vote_for_choice_of_other_question(self):
+        """
+        A choice that belongs to another question should be rejected
+        without recording a vote.
+        """
+        other_question = Question.objects.create(question_text='Other')
+        other_choice = Choice.objects.create(question=other_question,
+                                             choice_text='Elsewhere')
+        self.client.force_login(self.user)
+        response = self.client.post(
+            reverse('polls:vote', args=(self.question.id,)),
+            {'choice': other_choice.id})
+        self.assertContains(response, "Invalid choice selected.")
+        self.assertFalse(Vote.objects.filter(user=self.user).exists())
+
+    def test_vote_with_malformed_choice(self):
+        """
+        A choice id that is not a number should be rejected
+        without recording a vote.
+        """
+        self.client.force_login(self.user)
+        vote_url = reverse('polls:vote', args=(self.question.id,))
+        for choice_id in ('abc', '\u00b2', '9' * 30):
+            response = self.client.post(vote_url, {'choice': choice_id})
+            self.assertContains(response, "Invalid choice selected.")
+        response = self.client.post(vote_url, {})
+        self.assertContains(response, "You didn&#x27;t select a choice.")
+        self.assertFalse(Vote.objects.filter(user=self.user).exists())
+
+    def test_vote_after_end_date(self):
+        """
+        Voting on a question whose voting period has ended
+        should redirect to the index without recording a vote.
+        """
+        closed = Question.objects.create(question_text='Closed question')
+        closed.end_date = closed.pub_date
+        closed.save()
+        choice = Choice.objects.create(question=closed, choice_text='Late')
+        self.client.force_login(self.user)
+        response = self.client.post(reverse('polls:vote', args=(closed.id,)),
+                                    {'choice': choice.id})
+        self.assertRedirects(response, reverse('polls:index'))
+        self.assertFalse(Vote.objects.filter(user=self.user).exists())
+
+    def test_bulk_cast_votes(self):
+        """
+        Casting votes in bulk should skip duplicates
+        and leave the stored vote count in step.
+        """
+        other_user = User.objects.create(username='otheruser')
+        Vote.objects.bulk_cast([(self.user, self.choice),
+                                (other_user, self.choice),
+                                (self.user, self.choice)])
+
+        self.choice.refresh_from_db()
+        self.assertEqual(self.choice.vote_count, 2)
+        self.assertEqual(Vote.objects.filter(choice=self.choice).count(), 2)
+
+    def test_vote_created_outside_view_is_counted(self):
+        """
+        A vote created without the vote view, e.g. in the admin,
+        should be counted, so voting again moves it cleanly.
+        """
+        other = Choice.objects.create(question=self.question,
+                                      choice_text='Other choice')
+        Vote.objects.create(user=self.user, choice=self.choice)
+        self.choice.refresh_from_db()
+        self.assertEqual(self.choice.vote_count, 1)
+
+        self.client.force_login(self.user)
+        response = self.client.post(
+            reverse('polls:vote', args=(self.question.id,)),
+            {'choice': other.id})
+        self.assertRedirects(response, reverse('polls:results',
+                                               args=(self.question.id,)))
+        self.choice.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.choice.vote_count, 0)
+        self.assertEqual(other.vote_count, 1)
+
+    def test_moved_vote_takes_question_of_new_choice(self):
+        """
+        A vote moved by its choice id should take the question
+        of its new choice.
+        """
+        other_question = Question.objects.create(question_text='Other')
+        other = Choice.objects.create(question=other_question,
+                                      choice_text='Other choice')
+        vote = Vote.objects.create(user=self.user, choice=self.choice)
+        vote.choice_id = other.id
+        vote.save()
+
+        self.assertEqual(Vote.objects.get(pk=vote.pk).question,
+                         other_question)
+
+    def test_update_or_create_moves_vote_question(self):
+        """
+        A vote moved with update_or_create, which saves only the
+        changed fields, should take the question of its new choice.
+        """
+        other_question = Question.objects.create(question_text='Other')
+        other = Choice.objects.create(question=other_question,
+                                      choice_text='Other choice')
+        vote = Vote.objects.create(user=self.user, choice=self.choice)
+        Vote.objects.update_or_create(pk=vote.pk, defaults={'choice': other})
+        self.assertEqual(Vote.objects.get(pk=vote.pk).question,
+                         other_question)
+
+        Vote.objects.update_or_create(pk=vote.pk,
+                                      defaults={'choice_id': self.choice.id})
+        self.assertEqual(Vote.objects.get(pk=vote.pk).question,
+                         self.question)
+
+    def test_deleting_user_removes_their_votes_from_counts(self):
+        """
+        Deleting a user should take their votes off the stored counts.
+        """
+        other_user = User.objects.create(username='otheruser')
+        Vote.objects.create(user=self.user, choice=self.choice)
+        Vote.objects.create(user=other_user, choice=self.choice)
+        other_user.delete()
+
+        self.choice.refresh_from_db()
+        self.assertEqual(self.choice.vote_count, 1)
+
+    def test_recount_votes(self):
+        """
+        Recounting should repair vote counts that are out of step.
+        """
+        Vote.objects.create(user=self.user, choice=self.choice)
+        Choice.objects.filter(pk=self.choice.pk).update(vote_count=5)
+        Choice.objects.all().recount_votes()
+
+        self.choice.refresh_from_db()
+        self.assertEqual(self.choice.vote_count, 1)
+
+    def test_detail_shows_previous_choice(self):
+        """
+        The detail page should preselect the user's previous choice.
+        """
+        Vote.objects.create(user=self.user, choice=self.choice)
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('polls:detail',
+                                           args=(self.question.id,)))
+        previous_choice = response.context['previous_choice']
+        self.assertEqual(previous_choice, self.choice)
+        with self.assertNumQueries(0):
+            self.assertEqual(previous_choice.choice_text, 'Test choice')
+
+    def test_results_show_vote_totals(self):
+        """
+        The results page should show the stored vote count of each choice
+        without issuing a COUNT query per choice.
+        """
+        Choice.objects.filter(pk=self.choice.pk).update(vote_count=1)
+        Choice.objects.bulk_create([
+            Choice(question=self.question, choice_text=f'Extra {n}')
+            for n in range(3)
+        ])
+        url = reverse('polls:results', args=(self.question.id,))
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.context['tally'],
+                         [('Test choice', 1), ('Extra 0', 0),
+                          ('Extra 1', 0), ('Extra 2', 0)])
+
+    def test_results_flag_user_has_voted(self):
+        """
+        The results page should tell a user who has voted
+        that they can vote again.
+        """
+        self.client.force_login(self.user)
+        url = reverse('polls:results', args=(self.question.id,))
+        response = self.client.get(url)
+        self.assertFalse(response.context['question'].user_has_voted)
+        Vote.objects.create(user=self.user, choice=self.choice)
+        response = self.client.get(url)
+        self.assertTrue(response.context['question'].user_has_voted)
+        self.assertContains(response, "Vote Again")
+
+    def test_vote_admin_is_read_only(self):
+        """
+        Votes can be listed in the admin, but not added or changed there.
+        """
+        admin_user = User.objects.create_superuser(username='admin')
+        vote = Vote.objects.create(user=self.user, choice=self.choice)
+        self.client.force_login(admin_user)
+        response = self.client.get(reverse('admin:polls_vote_changelist'))
+        self.assertContains(response, 'testuser voted for Test choice')
+        response = self.client.get(reverse('admin:polls_vote_add'))
+        self.assertEqual(response.status_code, 403)
+        response = self.client.post(
+            reverse('admin:polls_vote_change', args=(vote.pk,)),
+            {'user': admin_user.pk, 'choice': self.choice.pk})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Vote.objects.get(pk=vote.pk).user, self.user)
+
+    def test_choice_admin_keeps_question_of_choice(self):
+        """
+        The question of an existing choice cannot be changed
+        in the admin, so its votes keep a matching question.
+        """
+        admin_user = User.objects.create_superuser(username='admin')
+        other_question = Question.objects.create(question_text='Other')
+        Vote.objects.create(user=self.user, choice=self.choice)
+        self.client.force_login(admin_user)
+        response = self.client.post(
+            reverse('admin:polls_choice_change', args=(self.choice.pk,)),
+            {'question': other_question.pk, 'choice_text': 'Renamed'})
+        self.assertEqual(response.status_code, 302)
+        self.choice.refresh_from_db()
+        self.assertEqual(self.choice.choice_text, 'Renamed')
+        self.assertEqual(self.choice.question, self.question)
+        self.assertEqual(Vote.objects.get(user=self.user).question,
+                         self.question)
+
+    def test_vote_str_with_related(self):
+        """
+        Votes fetched with their related rows should print
+        without issuing extra queries.
+        """
+        Vote.objects.create(user=self.user, choice=self.choice)
+        with self.assertNumQueries(1):
+            labels = [str(vote) for vote in Vote.objects.with_related()]
+        self.assertEqual(labels, ['testuser voted for Test choice'])
@@ -0,0 +1,13 @@
+from django.utils import timezone
+from polls.models import Question
+import datetime
+
+
+def create_question(question_text, days):
+    """
+    Create a question with the given `question_text` and publish the question
+    with a pub_date offset by the given number of `days` from now.
+    Negative values indicate a past date and positive values a future date.
+    """
+    time = timezone.now() + datetime.timedelta(days=days)
+    return Question.objects.create(question_text=question_text, pub_date=time)
@@ -3,47 +3,63 @@ Views for the Polls app.
 
 This module contains views for listing polls,
 displaying details and results,
-handling votes, and logging user actions.
+and handling votes.
 """
 
-from django.shortcuts import get_object_or_404, render, redirect
+from django.shortcuts import render, redirect
 from django.views import generic
 from django.utils import timezone
 from django.contrib import messages
+from django.db.models import Exists, Max, OuterRef
 from .models import Choice, Question, Vote
 from django.contrib.auth.decorators import login_required
 import logging
-from django.contrib.auth.signals import (
-    user_logged_in, user_logged_out, user_login_failed
-)
-from django.dispatch import receiver
+
+logger = logging.getLogger("polls")
+
+
+def get_request_now(request):
+    """
+    Return the current time, computed once per request.
+
+    Every query made while handling a request compares against the same
+    instant, so a question cannot open or close between two of them.
+    """
+    if not hasattr(request, '_polls_now'):
+        request._polls_now = timezone.now()
+    return request._polls_now
 
 
 class IndexView(generic.ListView):
-    """Display a list of all published polls,sorted by date, from newest to oldest."""
+    """Display a page of published polls, sorted by date, from newest to oldest."""
 
     template_name = 'polls/index.html'
     context_object_name = 'latest_question_list'
+    paginate_by = 25
 
     def get_queryset(self):
-        """Return all published questions, ordered by date from newest to oldest."""
-        return Question.objects.filter(
-            pub_date__lte=timezone.localtime()
-        ).order_by('-pub_date')
+        """
+        Return all published questions, ordered by date from newest to oldest.
+
+        Each question carries a 'voting_allowed' status computed by the database.
+        """
+        now = get_request_now(self.request)
+        return Question.objects.published(now).with_voting_allowed(now).order_by('-pub_date')
 
     def get_context_data(self, **kwargs):
         """
-        Add extra context to check if voting is allowed.
+        Add the publication date of the newest published question to the context.
 
-        This method adds a 'voting_allowed' status to each question in the context.
+        The template caches the rendered question list under a key made of this
+        date, the number of questions and the page number, so a new, published
+        or deleted question gets a fresh entry on every worker. The page header
+        with the user's name is rendered for each request.
         """
         context = super().get_context_data(**kwargs)
-        latest_questions = context['latest_question_list']
-
-        # Add voting allowed status for each question
-        for question in latest_questions:
-            question.voting_allowed = question.can_vote()
-
+        now = get_request_now(self.request)
+        context['latest_pub_date'] = Question.objects.published(now).aggregate(
+            latest=Max('pub_date')
+        )['latest']
         return context
 
 
@@ -54,8 +70,8 @@ class DetailView(generic.DetailView):
     template_name = 'polls/detail.html'
 
     def get_queryset(self):
-        """Exclude questions that aren't published yet."""
-        return Question.objects.filter(pub_date__lte=timezone.localtime())
+        """Exclude questions that aren't published yet, fetching their choices up front."""
+        return Question.objects.published(get_request_now(self.request)).prefetch_related('choice_set')
 
     def get_context_data(self, **kwargs):
         """
@@ -77,11 +93,13 @@ class DetailView(generic.DetailView):
         this_user = self.request.user
 
         if this_user.is_authenticated:
-            try:
-                previous_vote = Vote.objects.get(user=this_user, choice__question=question)
+            previous_vote = Vote.objects.filter(
+                user=this_user, question_id=question.pk
+            ).select_related('choice').only('id', 'choice__id', 'choice__choice_text').first()
+            if previous_vote:
                 context['previous_choice'] = previous_vote.choice
                 logger.debug(f"Previous choice for user {this_user.username}: {previous_vote.choice.choice_text}")
-            except Vote.DoesNotExist:
+            else:
                 context['previous_choice'] = None
                 logger.debug(f"No previous vote found for user {this_user.username}")
         else:
@@ -97,6 +115,33 @@ class ResultsView(generic.DetailView):
     model = Question
     template_name = 'polls/results.html'
 
+    def get_queryset(self):
+        """
+        Return questions, flagging whether the authenticated user has voted on each.
+
+        The flag is an EXISTS subquery, so the user's vote row is never fetched.
+        """
+        queryset = Question.objects.all()
+        user = self.request.user
+        if user.is_authenticated:
+            queryset = queryset.annotate(user_has_voted=Exists(
+                Vote.objects.filter(user_id=user.id, question_id=OuterRef('pk'))
+            ))
+        return queryset
+
+    def get_context_data(self, **kwargs):
+        """
+        Add the vote tally of the question to the context.
+
+        The tally is a list of (choice text, vote count) pairs read in one query,
+        without building Choice objects.
+        """
+        context = super().get_context_data(**kwargs)
+        context['tally'] = list(
+            self.object.choice_set.order_by('pk').values_list('choice_text', 'vote_count')
+        )
+        return context
+
 
 @login_required(login_url='login')
 def vote(request, question_id):
@@ -105,6 +150,7 @@ def vote(request, question_id):
 
     Checks if the user is allowed to vote on the specified question.
     Updates the user's vote if they have already voted, otherwise creates a new vote.
+    The stored vote counts of the affected choices are adjusted in the same transaction.
     Redirects to the results page with a success message or the detail page with an error message.
 
     Args:
@@ -114,155 +160,35 @@ def vote(request, question_id):
     Returns:
         HttpResponseRedirect: Redirects to the results page or back to the detail page with an error message.
     """
-    question = get_object_or_404(Question, pk=question_id)
-
-    if not question.can_vote():
+    # Check if voting is allowed, without loading the question
+    now = get_request_now(request)
+    if not Question.objects.filter(Question.published_can_vote_q(now), pk=question_id).exists():
         return redirect('polls:index')
 
-    choice_id = request.POST.get('choice')
-    if not choice_id:
+    # Check that the choice belongs to this question, reading only the columns we need;
+    # a missing or malformed choice id is rejected without querying for it
+    choice_id = request.POST.get('choice', '')
+    selected_choice = choice_id.isdecimal() and Choice.objects.filter(
+        pk=choice_id, question_id=question_id
+    ).values_list('pk', 'choice_text').first()
+    if not selected_choice:
+        # Only now is the question needed, to show the form again
+        question = Question.objects.only('id', 'question_text').get(pk=question_id)
         return render(request, 'polls/detail.html', {
             'question': question,
-            'error_message': "You didn't select a choice.",
+            'error_message': "Invalid choice selected." if choice_id else "You didn't select a choice.",
         })
+    choice_pk, choice_text = selected_choice
 
-    try:
-        selected_choice = question.choice_set.get(pk=choice_id)
-    except Choice.DoesNotExist:
-        return render(request, 'polls/detail.html', {
-            'question': question,
-            'error_message': "Invalid choice selected.",
-        })
-
-    # Check if the user has already voted
-    previous_vote = Vote.objects.filter(user=request.user, choice__question=question).first()
-    if previous_vote:
-        # If the user has voted before, update the vote
-        previous_vote.choice = selected_choice
-        previous_vote.save()
-    else:
-        # Create a new vote
-        Vote.objects.create(user=request.user, choice=selected_choice)
+    # Update the user's vote, or create it if this is their first vote; the
+    # vote counts of the choices are adjusted by the receivers in polls.signals
+    # in the same transaction
+    Vote.objects.update_or_create(
+        user=request.user, question_id=question_id,
+        defaults={'choice_id': choice_pk},
+    )
 
     # Add the message
-    messages.success(request, f"Your vote for {selected_choice.choice_text} has been recorded.")
-
-    return redirect('polls:results', question.id)
+    messages.success(request, f"Your vote for {choice_text} has been recorded.")
 
-
-def index(request):
-    """Display a list of the latest five published questions."""
-    latest_question_list = Question.objects.filter(
-        pub_date__lte=timezone.localtime()
-    ).order_by('-pub_date')[:5]
-    context = {'latest_question_list': latest_question_list}
-    return render(request, 'polls/index.html', context)
-
-
-@login_required(login_url='login')
-def detail(request, question_id):
-    """
-    Display the details of a specific question.
-
-    Checks if voting is allowed for the question. If not, redirects to the index page with an error message.
-    Also checks if the user has previously voted on this question and passes the choice to the template.
-
-    Args:
-        request: The HTTP request object.
-        question_id: The ID of the question to be displayed.
-
-    Returns:
-        HttpResponse: Renders the detail page for the specified question.
-    """
-    question = get_object_or_404(Question, pk=question_id)
-
-    # Check if voting is allowed
-    if not question.can_vote():
-        messages.error(request, "Voting is not allowed for this poll.")
-        return redirect('polls:index')
-
-    # Check if the user has already voted on this question
-    previous_vote = None
-    if request.user.is_authenticated:
-        previous_vote = Vote.objects.filter(
-            user=request.user, choice__question=question
-        ).first()
-
-    return render(request, 'polls/detail.html', {
-        'question': question,
-        'previous_choice': previous_vote.choice if previous_vote else None,
-    })
-
-
-def results(request, question_id):
-    """
-    Display the results of a specific question.
-
-    Retrieves the vote confirmation from the session and renders the results page for the specified question.
-
-    Args:
-        request: The HTTP request object.
-        question_id: The ID of the question whose results are to be displayed.
-
-    Returns:
-        HttpResponse: Renders the results page for the specified question.
-    """
-    question = get_object_or_404(Question, pk=question_id)
-
-    # Retrieve the vote confirmation from the session
-    voted_choice = request.session.get(f'voted_for_{question.id}', None)
-
-    return render(request, 'polls/results.html', {
-        'question': question,
-        'voted_choice': voted_choice,  # Pass the voted choice to the template
-    })
-
-
-logger = logging.getLogger("polls")
-
-
-@receiver(user_logged_in)
-def log_user_login(sender, request, user, **kwargs):
-    """
-    Log user login events.
-
-    Record the login event with the user's username and IP address.
-    """
-    ip_addr = get_client_ip(request)
-    logger.info(f"{user.username} logged in from {ip_addr}")
-
-
-@receiver(user_logged_out)
-def log_user_logout(sender, request, user, **kwargs):
-    """
-    Log user logout events.
-
-    Record the logout event with the user's username and IP address.
-    """
-    ip_addr = get_client_ip(request)
-    logger.info(f"{user.username} logged out from {ip_addr}")
-
-
-@receiver(user_login_failed)
-def log_user_login_failed(sender, credentials, request, **kwargs):
-    """
-    Log failed login attempts.
-
-    Record failed login attempts with the username and IP address.
-    """
-    ip_addr = get_client_ip(request)
-    logger.warning(f"Failed login for {credentials.get('username')} from {ip_addr}")
-
-
-def get_client_ip(request):
-    """
-    Get the visitor’s IP address using request headers.
-
-    Returns the IP address from the HTTP_X_FORWARDED_FOR header or REMOTE_ADDR.
-    """
-    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-    if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0]
-    else:
-        ip = request.META.get('REMOTE_ADDR')
-    return ip
+    return redirect('polls:results', question_id)